@@ -5,7 +5,7 @@ import sys
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QColor, QPalette
 
-from theme import COLORS
+from theme import get_colors
 from window import ClaudeWindow
 
 
@@ -14,18 +14,23 @@ def main():
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
+    colors = get_colors()
+    bg_primary = QColor(colors.bg_primary)
+    text_primary = QColor(colors.text_primary)
+
     palette = QPalette()
-    palette.setColor(QPalette.ColorRole.Window, QColor(COLORS['bg_primary']))
-    palette.setColor(QPalette.ColorRole.WindowText, QColor(COLORS['text_primary']))
-    palette.setColor(QPalette.ColorRole.Base, QColor(COLORS['bg_primary']))
-    palette.setColor(QPalette.ColorRole.Text, QColor(COLORS['text_primary']))
-    palette.setColor(QPalette.ColorRole.Button, QColor(COLORS['bg_secondary']))
-    palette.setColor(QPalette.ColorRole.ButtonText, QColor(COLORS['text_primary']))
-    palette.setColor(QPalette.ColorRole.Highlight, QColor(COLORS['accent']))
+    palette.setColor(QPalette.ColorRole.Window, bg_primary)
+    palette.setColor(QPalette.ColorRole.WindowText, text_primary)
+    palette.setColor(QPalette.ColorRole.Base, bg_primary)
+    palette.setColor(QPalette.ColorRole.Text, text_primary)
+    palette.setColor(QPalette.ColorRole.Button, QColor(colors.bg_secondary))
+    palette.setColor(QPalette.ColorRole.ButtonText, text_primary)
+    palette.setColor(QPalette.ColorRole.Highlight, QColor(colors.accent))
     app.setPalette(palette)
 
     window = ClaudeWindow()
     window.show()
+    window.preload_models()
 
     sys.exit(app.exec())
 
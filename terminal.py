@@ -1,94 +1,106 @@
-"""Terminal widget with PTY support."""
+"""Terminal sessions with PTY support and the widget that shows them."""
 
 import os
 import threading
+from functools import partial
 from typing import Optional
 
-from PyQt6.QtWidgets import QApplication, QPlainTextEdit, QMenu
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QKeyEvent
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit, QPlainTextDocumentLayout, QMenu
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QTimer, QElapsedTimer
+from PyQt6.QtGui import QFont, QKeyEvent, QTextCursor, QTextDocument
 
 import winpty
 import pyte
 
-from theme import COLORS
-
-
-class TerminalWidget(QPlainTextEdit):
-    """Real terminal emulator widget using PTY."""
-
-    data_ready = pyqtSignal(str)
+# Minimum time between two feeds to pyte; output arriving sooner is batched
+FLUSH_INTERVAL_MS = 30
+
+# Quiet period after the last resize event before the PTY is resized
+RESIZE_DELAY_MS = 75
+
+# Bytes sent to the PTY for special keys, whatever the modifiers
+KEY_SEQUENCES = {
+    Qt.Key.Key_Return: "\r",
+    Qt.Key.Key_Enter: "\r",
+    Qt.Key.Key_Backspace: "\x7f",
+    Qt.Key.Key_Tab: "\t",
+    Qt.Key.Key_Escape: "\x1b",
+    Qt.Key.Key_Up: "\x1b[A",
+    Qt.Key.Key_Down: "\x1b[B",
+    Qt.Key.Key_Right: "\x1b[C",
+    Qt.Key.Key_Left: "\x1b[D",
+    Qt.Key.Key_Home: "\x1b[H",
+    Qt.Key.Key_End: "\x1b[F",
+    Qt.Key.Key_Delete: "\x1b[3~",
+    Qt.Key.Key_PageUp: "\x1b[5~",
+    Qt.Key.Key_PageDown: "\x1b[6~",
+}
+
+# Ctrl+A..Ctrl+Z map to the control characters 0x01..0x1a (Ctrl+C is ^C etc.)
+CTRL_SEQUENCES = {
+    key: chr(key - Qt.Key.Key_A + 1) for key in range(Qt.Key.Key_A, Qt.Key.Key_Z + 1)
+}
+
+# Scrollback kept by pyte and by the document
+HISTORY_LINES = 10_000
+
+
+def render_row(row, columns: Optional[int] = None) -> str:
+    """Render a sparse pyte row, visiting only the cells that were written."""
+    if not row:
+        return ""
+    width = max(row) + 1
+    if columns is not None:
+        width = min(width, columns)
+    chars = [" "] * width
+    for x, char in row.items():
+        if x < width:
+            chars[x] = char.data or " "
+    return "".join(chars).rstrip()
+
+
+class TerminalSession(QObject):
+    """A shell in a PTY, rendered through pyte into its own document.
+
+    Sessions keep rendering while their tab is hidden; only the session
+    shown in the TerminalView has a widget attached.
+    """
+
+    data_ready = pyqtSignal()
+    # Emitted after the document has been brought up to date with the screen
+    updated = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.pty_process: Optional[winpty.PTY] = None
-        self.screen = pyte.HistoryScreen(120, 30, history=10000)
+        self.screen = pyte.HistoryScreen(120, 30, history=HISTORY_LINES)
         self.stream = pyte.Stream(self.screen)
         self.read_thread: Optional[threading.Thread] = None
         self.running = False
-        self._last_text = ""
-        self._user_scrolling = False
-
-        self.setup_ui()
-        self.data_ready.connect(self.process_output)
-        self.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        self._screen_lines: list[str] = [""]
+        self._row_lines: list[str] = []
+        self._history_tail = None
+        self._pending: list[str] = []
+        self._pending_lock = threading.Lock()
+
+        # Where the view left this session, restored when it is shown again
+        self.user_scrolling = False
+        self.scroll_value = 0
+
+        self.document = QTextDocument(self)
+        self.document.setDocumentLayout(QPlainTextDocumentLayout(self.document))
+        self.document.setUndoRedoEnabled(False)
+        self.document.setMaximumBlockCount(HISTORY_LINES)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
+        self._since_flush = QElapsedTimer()
+
+        self.data_ready.connect(self._schedule_flush)
         self.start_pty()
 
-    def setup_ui(self):
-        self.setReadOnly(True)
-        self.setFont(QFont("Consolas", 11))
-        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
-        self.setTextInteractionFlags(
-            Qt.TextInteractionFlag.TextSelectableByMouse |
-            Qt.TextInteractionFlag.TextSelectableByKeyboard
-        )
-        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.show_context_menu)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.setStyleSheet(f"""
-            QPlainTextEdit {{
-                background-color: {COLORS['terminal_bg']};
-                color: {COLORS['terminal_fg']};
-                border: none;
-                padding: 8px;
-                selection-background-color: {COLORS['accent']};
-            }}
-            QScrollBar:vertical {{
-                background: {COLORS['bg_primary']};
-                width: 10px;
-                border-radius: 5px;
-            }}
-            QScrollBar::handle:vertical {{
-                background: {COLORS['border']};
-                border-radius: 5px;
-                min-height: 20px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background: {COLORS['text_muted']};
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-            QScrollBar:horizontal {{
-                background: {COLORS['bg_primary']};
-                height: 10px;
-                border-radius: 5px;
-            }}
-            QScrollBar::handle:horizontal {{
-                background: {COLORS['border']};
-                border-radius: 5px;
-                min-width: 20px;
-            }}
-            QScrollBar::handle:horizontal:hover {{
-                background: {COLORS['text_muted']};
-            }}
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
-                width: 0px;
-            }}
-        """)
-        self.setCursorWidth(8)
-
     def start_pty(self):
         """Start PTY with shell."""
         try:
@@ -101,11 +113,11 @@ class TerminalWidget(QPlainTextEdit):
             self.read_thread = threading.Thread(target=self.read_pty, daemon=True)
             self.read_thread.start()
 
-            QTimer.singleShot(500, lambda: self.write_to_pty("claude\r"))
+            QTimer.singleShot(500, partial(self.write_to_pty, "claude\r"))
             QTimer.singleShot(1500, self.auto_press_one)
 
         except Exception as e:
-            self.setPlainText(f"Error starting terminal: {e}\n\nMake sure winpty is installed correctly.")
+            self.document.setPlainText(f"Error starting terminal: {e}\n\nMake sure winpty is installed correctly.")
 
     def auto_press_one(self):
         """Auto-press 1 to select first option in Claude menu."""
@@ -113,58 +125,151 @@ class TerminalWidget(QPlainTextEdit):
             self.write_to_pty("1")
 
     def read_pty(self):
-        """Read output from PTY in background thread."""
-        import time
+        """Read output from PTY in background thread.
+
+        Reads block until the shell writes something, so an idle session
+        does not wake the thread at all. The PTY output is a pipe, which
+        Windows cannot signal for readability, so there is no handle to hand
+        to a QWinEventNotifier and a reader thread is needed.
+        """
         while self.running and self.pty_process:
             try:
-                data = self.pty_process.read()
+                data = self.pty_process.read(blocking=True)
                 if data:
-                    self.data_ready.emit(data)
-                time.sleep(0.005)
+                    self._queue_output(data)
+                elif self.pty_process.iseof():
+                    raise EOFError
             except Exception:
                 if self.running:
-                    self.data_ready.emit("\n[Session ended]\n")
+                    self._queue_output("\n[Session ended]\n")
                 break
 
+    def _queue_output(self, data: str):
+        """Queue PTY output for the GUI thread, waking it only once per batch."""
+        with self._pending_lock:
+            wake = not self._pending
+            self._pending.append(data)
+        if wake:
+            self.data_ready.emit()
+
+    def _schedule_flush(self):
+        """Feed output right away after a quiet spell, else at the end of the interval.
+
+        A keystroke echo after idle time is rendered immediately; only output
+        that follows a flush within FLUSH_INTERVAL_MS waits for the timer.
+        """
+        if self._flush_timer.isActive():
+            return
+        if not self._since_flush.isValid() or self._since_flush.hasExpired(FLUSH_INTERVAL_MS):
+            self._flush_pending()
+        else:
+            self._flush_timer.start(FLUSH_INTERVAL_MS - self._since_flush.elapsed())
+
+    def _flush_pending(self):
+        """Feed everything read since the last flush in a single pass.
+
+        pywinpty decodes output in its native layer and hands over str, so a
+        batch costs one join and one Stream.feed with no decoding here.
+        """
+        self._since_flush.start()
+        with self._pending_lock:
+            chunks, self._pending = self._pending, []
+        if chunks:
+            self.process_output("".join(chunks))
+
     def process_output(self, data: str):
         self.stream.feed(data)
         self.render_screen()
 
-    def _on_scroll(self, value):
-        """Track if user is scrolling manually."""
-        scrollbar = self.verticalScrollBar()
-        self._user_scrolling = value < scrollbar.maximum() - 10
-
     def render_screen(self):
-        lines = []
-
-        # Add history lines (scrolled up content)
-        for hist_line in self.screen.history.top:
-            line = "".join(char.data or " " for char in hist_line.values())
-            lines.append(line.rstrip())
-
-        # Add current screen lines
-        for y in range(self.screen.lines):
-            line = "".join(self.screen.buffer[y][x].data or " " for x in range(self.screen.columns))
-            lines.append(line.rstrip())
-
-        # Remove trailing empty lines
-        while lines and not lines[-1]:
-            lines.pop()
-
-        new_text = "\n".join(lines)
+        # pyte marks rows dirty for every visible change, scrolling into
+        # history included, so an empty set means there is nothing to do
+        if not self.screen.dirty:
+            return
+
+        new_history = self._new_history_lines()
+
+        # Re-render only the rows pyte marked dirty since the last pass
+        screen = self.screen
+        rows = self._row_lines
+        if len(rows) != screen.lines:
+            del rows[screen.lines:]
+            rows.extend([""] * (screen.lines - len(rows)))
+        buffer = screen.buffer
+        for y in screen.dirty:
+            if y < screen.lines:
+                rows[y] = render_row(buffer.get(y), screen.columns)
+        screen.dirty.clear()
+
+        # Current screen lines, minus trailing empty ones (a document always keeps one block)
+        end = len(rows)
+        while end > 1 and not rows[end - 1]:
+            end -= 1
+        screen_lines = rows[:end]
 
         # Only update if content changed
-        if new_text != self._last_text:
-            self._last_text = new_text
-            self.blockSignals(True)
-            self.setPlainText(new_text)
-            self.blockSignals(False)
-
-            # Auto-scroll only if user isn't scrolling up
-            if not self._user_scrolling:
-                scrollbar = self.verticalScrollBar()
-                scrollbar.setValue(scrollbar.maximum())
+        if new_history == [] and screen_lines == self._screen_lines:
+            return
+
+        if new_history is None:
+            # History was cleared or outran us, rebuild the whole document
+            history = [render_row(line) for line in self.screen.history.top]
+            self.document.setPlainText("\n".join(history + screen_lines))
+        else:
+            # Lines that scrolled off the screen turn into history blocks
+            # ahead of the live screen region at the end of the document.
+            # Each history line is rendered exactly once, here, so older
+            # history costs nothing per render.
+            self._apply_tail([render_row(line) for line in new_history] + screen_lines)
+        self._screen_lines = screen_lines
+        self.updated.emit()
+
+    def _new_history_lines(self) -> Optional[list]:
+        """Return history lines added since the last render, or None if history was reset."""
+        top = self.screen.history.top
+        last = self._history_tail
+        self._history_tail = top[-1] if top else None
+
+        if last is None:
+            return list(top)
+        new_lines = []
+        for line in reversed(top):
+            if line is last:
+                new_lines.reverse()
+                return new_lines
+            new_lines.append(line)
+        return None
+
+    def _apply_tail(self, lines: list[str]):
+        """Rewrite the live screen region at the end of the document.
+
+        Only blocks whose text changed are touched; extra lines are appended
+        and surplus trailing blocks removed.
+        """
+        old_lines = self._screen_lines
+        kept = min(len(old_lines), len(lines))
+        document = self.document
+        start = document.blockCount() - len(old_lines)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+
+        for i in range(kept):
+            if lines[i] != old_lines[i]:
+                block = document.findBlockByNumber(start + i)
+                cursor.setPosition(block.position())
+                cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+                cursor.insertText(lines[i])
+
+        if len(lines) > kept:
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText("\n" + "\n".join(lines[kept:]))
+        elif len(old_lines) > kept:
+            last = document.findBlockByNumber(start + kept - 1)
+            cursor.setPosition(last.position() + last.length() - 1)
+            cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+
+        cursor.endEditBlock()
 
     def write_to_pty(self, data: str):
         """Write data to PTY."""
@@ -174,11 +279,113 @@ class TerminalWidget(QPlainTextEdit):
             except Exception as e:
                 print(f"Write error: {e}")
 
+    def resize(self, cols: int, rows: int):
+        """Resize the PTY and screen, if the size changed."""
+        if not self.pty_process or (cols, rows) == (self.screen.columns, self.screen.lines):
+            return
+        try:
+            self.pty_process.set_size(cols, rows)
+            self.screen.resize(rows, cols)
+        except:
+            pass
+
+    def cleanup(self):
+        """Stop the reader thread and release the PTY.
+
+        cancel_io (pywinpty 3.0+) aborts the reader's blocking read so the
+        thread exits; the shell goes away once the last reference to the PTY
+        is dropped.
+        """
+        self.running = False
+        pty_process, self.pty_process = self.pty_process, None
+        if pty_process:
+            try:
+                pty_process.cancel_io()
+            except Exception as e:
+                print(f"Cancel error: {e}")
+
+
+class TerminalView(QPlainTextEdit):
+    """Terminal widget showing one TerminalSession's document at a time.
+
+    A single view serves every tab: switching tabs swaps the document, so
+    hidden sessions cost no widget, layout or styling.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.session: Optional[TerminalSession] = None
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_DELAY_MS)
+        self._resize_timer.timeout.connect(self._apply_pending_resize)
+
+        self.setup_ui()
+        self.verticalScrollBar().valueChanged.connect(self._on_scroll)
+
+    def setup_ui(self):
+        self.setReadOnly(True)
+        self.setFont(QFont("Consolas", 11))
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.setTextInteractionFlags(
+            Qt.TextInteractionFlag.TextSelectableByMouse |
+            Qt.TextInteractionFlag.TextSelectableByKeyboard
+        )
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setObjectName("terminal")
+        self.setCursorWidth(8)
+
+    def set_session(self, session: TerminalSession):
+        """Show a session's document in this view."""
+        if session is self.session:
+            return
+        scrollbar = self.verticalScrollBar()
+        if self.session is not None:
+            self.session.scroll_value = scrollbar.value()
+            self.session.updated.disconnect(self._on_session_updated)
+
+        # setDocument moves the scrollbar while its range still belongs to
+        # the old document, so _on_scroll must not attribute that to a session
+        self.session = None
+        follow = not session.user_scrolling
+        # The widget font is not carried over to a new document
+        session.document.setDefaultFont(self.font())
+        self.setDocument(session.document)
+        self.session = session
+        session.updated.connect(self._on_session_updated)
+
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+        else:
+            scrollbar.setValue(session.scroll_value)
+        # The session may have been sized for a different viewport
+        self._resize_timer.start()
+
+    def _on_scroll(self, value):
+        """Track if user is scrolling manually."""
+        if self.session is not None:
+            scrollbar = self.verticalScrollBar()
+            self.session.user_scrolling = value < scrollbar.maximum() - 10
+
+    def _on_session_updated(self):
+        # Auto-scroll only if user isn't scrolling up
+        if not self.session.user_scrolling:
+            scrollbar = self.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
+
+    def write_to_pty(self, data: str):
+        """Write data to the shown session's PTY."""
+        if self.session is not None:
+            self.session.write_to_pty(data)
+
     def keyPressEvent(self, event: QKeyEvent):
         """Handle keyboard input."""
         key = event.key()
         modifiers = event.modifiers()
-        text = event.text()
 
         if modifiers == (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier):
             if key == Qt.Key.Key_C:
@@ -188,82 +395,39 @@ class TerminalWidget(QPlainTextEdit):
                 self.paste_clipboard()
                 return
 
-        if key == Qt.Key.Key_Return or key == Qt.Key.Key_Enter:
-            self.write_to_pty("\r")
-        elif key == Qt.Key.Key_Backspace:
-            self.write_to_pty("\x7f")
-        elif key == Qt.Key.Key_Tab:
-            self.write_to_pty("\t")
-        elif key == Qt.Key.Key_Escape:
-            self.write_to_pty("\x1b")
-        elif key == Qt.Key.Key_Up:
-            self.write_to_pty("\x1b[A")
-        elif key == Qt.Key.Key_Down:
-            self.write_to_pty("\x1b[B")
-        elif key == Qt.Key.Key_Right:
-            self.write_to_pty("\x1b[C")
-        elif key == Qt.Key.Key_Left:
-            self.write_to_pty("\x1b[D")
-        elif key == Qt.Key.Key_Home:
-            self.write_to_pty("\x1b[H")
-        elif key == Qt.Key.Key_End:
-            self.write_to_pty("\x1b[F")
-        elif key == Qt.Key.Key_Delete:
-            self.write_to_pty("\x1b[3~")
-        elif key == Qt.Key.Key_PageUp:
-            self.write_to_pty("\x1b[5~")
-        elif key == Qt.Key.Key_PageDown:
-            self.write_to_pty("\x1b[6~")
+        sequence = KEY_SEQUENCES.get(key)
+        if sequence is not None:
+            self.write_to_pty(sequence)
         elif modifiers == Qt.KeyboardModifier.ControlModifier:
-            if key == Qt.Key.Key_C:
-                self.write_to_pty("\x03")
-            elif key == Qt.Key.Key_D:
-                self.write_to_pty("\x04")
-            elif key == Qt.Key.Key_Z:
-                self.write_to_pty("\x1a")
-            elif key == Qt.Key.Key_L:
-                self.write_to_pty("\x0c")
-            elif key >= Qt.Key.Key_A and key <= Qt.Key.Key_Z:
-                self.write_to_pty(chr(key - Qt.Key.Key_A + 1))
-        elif text:
-            self.write_to_pty(text)
+            sequence = CTRL_SEQUENCES.get(key)
+            if sequence is not None:
+                self.write_to_pty(sequence)
+        else:
+            text = event.text()
+            if text:
+                self.write_to_pty(text)
 
     def resizeEvent(self, event):
-        """Handle resize - update PTY size."""
+        """Handle resize - update PTY size once the size settles."""
         super().resizeEvent(event)
-        if self.pty_process:
-            font_metrics = self.fontMetrics()
-            char_width = font_metrics.averageCharWidth()
-            char_height = font_metrics.height()
+        if self.session is not None:
+            self._resize_timer.start()
 
-            cols = max(80, self.viewport().width() // char_width)
-            rows = max(24, self.viewport().height() // char_height)
+    def _apply_pending_resize(self):
+        """Resize the shown session to fit the viewport."""
+        if self.session is None:
+            return
+        font_metrics = self.fontMetrics()
+        char_width = font_metrics.averageCharWidth()
+        char_height = font_metrics.height()
 
-            try:
-                self.pty_process.set_size(cols, rows)
-                self.screen.resize(rows, cols)
-            except:
-                pass
+        cols = max(80, self.viewport().width() // char_width)
+        rows = max(24, self.viewport().height() // char_height)
+        self.session.resize(cols, rows)
 
     def show_context_menu(self, pos):
         """Show context menu with copy/paste options."""
         menu = QMenu(self)
-        menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: {COLORS['bg_secondary']};
-                color: {COLORS['text_primary']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 4px;
-            }}
-            QMenu::item {{
-                padding: 6px 20px;
-                border-radius: 4px;
-            }}
-            QMenu::item:selected {{
-                background-color: {COLORS['bg_hover']};
-            }}
-        """)
 
         copy_action = menu.addAction("Copy (Ctrl+Shift+C)")
         copy_action.triggered.connect(self.copy_selection)
@@ -291,12 +455,3 @@ class TerminalWidget(QPlainTextEdit):
         text = clipboard.text()
         if text:
             self.write_to_pty(text)
-
-    def cleanup(self):
-        """Clean up resources."""
-        self.running = False
-        if self.pty_process:
-            try:
-                self.pty_process.close()
-            except:
-                pass
@@ -1,5 +1,7 @@
 """Theme colors and constants."""
 
+from dataclasses import dataclass
+
 DARK_THEME = {
     'bg_primary': '#1c1c1a',
     'bg_secondary': '#252523',
@@ -32,11 +34,218 @@ LIGHT_THEME = {
     'close_hover': '#e55050',
 }
 
+
+@dataclass(frozen=True, slots=True)
+class ThemeSnapshot:
+    """One theme's colors as attributes."""
+
+    bg_primary: str
+    bg_secondary: str
+    bg_tertiary: str
+    bg_hover: str
+    accent: str
+    accent_light: str
+    text_primary: str
+    text_secondary: str
+    text_muted: str
+    border: str
+    terminal_bg: str
+    terminal_fg: str
+    close_hover: str
+
+
 # Current theme (default: dark)
 _current_theme = 'dark'
 COLORS = DARK_THEME.copy()
 
 
+def _build_stylesheet(t: ThemeSnapshot) -> str:
+    """Format the application stylesheet for the given colors.
+
+    Widgets are matched by object name; state that changes at runtime (the
+    selected tab, the recording mic) is a dynamic property, so switching it
+    only needs a re-polish of that widget.
+    """
+    return f"""
+        #central {{
+            background-color: {t.bg_primary};
+            border-radius: 10px;
+        }}
+        #separator {{
+            background-color: {t.border};
+        }}
+
+        /* Terminal */
+        QPlainTextEdit#terminal {{
+            background-color: {t.terminal_bg};
+            color: {t.terminal_fg};
+            border: none;
+            padding: 8px;
+            selection-background-color: {t.accent};
+        }}
+        #terminal QScrollBar:vertical {{
+            background: {t.bg_primary};
+            width: 10px;
+            border-radius: 5px;
+        }}
+        #terminal QScrollBar::handle:vertical {{
+            background: {t.border};
+            border-radius: 5px;
+            min-height: 20px;
+        }}
+        #terminal QScrollBar::handle:vertical:hover {{
+            background: {t.text_muted};
+        }}
+        #terminal QScrollBar::add-line:vertical, #terminal QScrollBar::sub-line:vertical {{
+            height: 0px;
+        }}
+        #terminal QScrollBar:horizontal {{
+            background: {t.bg_primary};
+            height: 10px;
+            border-radius: 5px;
+        }}
+        #terminal QScrollBar::handle:horizontal {{
+            background: {t.border};
+            border-radius: 5px;
+            min-width: 20px;
+        }}
+        #terminal QScrollBar::handle:horizontal:hover {{
+            background: {t.text_muted};
+        }}
+        #terminal QScrollBar::add-line:horizontal, #terminal QScrollBar::sub-line:horizontal {{
+            width: 0px;
+        }}
+
+        /* Terminal context menu */
+        QMenu {{
+            background-color: {t.bg_secondary};
+            color: {t.text_primary};
+            border: 1px solid {t.border};
+            border-radius: 6px;
+            padding: 4px;
+        }}
+        QMenu::item {{
+            padding: 6px 20px;
+            border-radius: 4px;
+        }}
+        QMenu::item:selected {{
+            background-color: {t.bg_hover};
+        }}
+
+        /* Title bar */
+        #titleBar {{
+            background-color: {t.bg_primary};
+        }}
+        #appLabel {{
+            color: {t.text_muted};
+            font-size: 13px;
+            padding-right: 12px;
+        }}
+        #newTabButton, #minimizeButton, #maximizeButton, #closeButton {{
+            background-color: transparent;
+            color: {t.text_muted};
+            border: none;
+        }}
+        #newTabButton {{
+            padding: 6px 12px;
+            font-size: 14px;
+        }}
+        #minimizeButton, #maximizeButton {{
+            padding: 8px 14px;
+            font-size: 12px;
+        }}
+        #closeButton {{
+            padding: 8px 14px;
+            font-size: 14px;
+        }}
+        #newTabButton:hover, #minimizeButton:hover, #maximizeButton:hover {{
+            background-color: {t.bg_hover};
+            color: {t.text_primary};
+        }}
+        #closeButton:hover {{
+            background-color: {t.close_hover};
+            color: white;
+        }}
+
+        /* Tabs */
+        #tabButton {{
+            background-color: transparent;
+            color: {t.text_muted};
+            border: none;
+            border-radius: 6px;
+            padding: 6px 12px;
+            font-size: 12px;
+        }}
+        #tabButton:hover {{
+            background-color: {t.bg_hover};
+            color: {t.text_secondary};
+        }}
+        #tabButton[tabSelected="true"], #tabButton[tabSelected="true"]:hover {{
+            background-color: {t.bg_tertiary};
+            color: {t.text_primary};
+        }}
+
+        /* Status bar */
+        #statusBar {{
+            background-color: {t.bg_secondary};
+        }}
+        #statusLabel {{
+            color: {t.text_muted};
+            font-size: 11px;
+        }}
+        #hintsLabel {{
+            color: {t.text_muted};
+            font-size: 10px;
+            margin-left: 10px;
+        }}
+        #micButton, #themeButton {{
+            background-color: {t.bg_tertiary};
+            color: {t.text_muted};
+            border: none;
+            border-radius: 4px;
+            font-size: 12px;
+        }}
+        #micButton:hover, #themeButton:hover {{
+            background-color: {t.bg_hover};
+            color: {t.text_primary};
+        }}
+        #micButton:disabled {{
+            color: {t.border};
+        }}
+        #micButton[recording="true"] {{
+            background-color: #cc4444;
+            color: white;
+        }}
+        #micButton[recording="true"]:hover {{
+            background-color: #dd5555;
+        }}
+    """
+
+
+# Snapshot per theme name, built the first time the theme is used
+_snapshot_cache: dict[str, ThemeSnapshot] = {}
+
+
+def get_colors() -> ThemeSnapshot:
+    """Get the current theme's colors."""
+    colors = _snapshot_cache.get(_current_theme)
+    if colors is None:
+        colors = _snapshot_cache[_current_theme] = ThemeSnapshot(**COLORS)
+    return colors
+
+
+# Formatted stylesheet per theme name, so toggling back and forth formats each theme once
+_stylesheet_cache: dict[str, str] = {}
+
+
+def get_stylesheet() -> str:
+    """Get the application stylesheet for the current theme."""
+    sheet = _stylesheet_cache.get(_current_theme)
+    if sheet is None:
+        sheet = _stylesheet_cache[_current_theme] = _build_stylesheet(get_colors())
+    return sheet
+
+
 def get_theme() -> str:
     """Get current theme name."""
     return _current_theme
@@ -1,7 +1,18 @@
 """Text translation module using MarianMT."""
 
+import threading
+from collections import OrderedDict
 from typing import Optional, Callable
 
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+# Token limits for greedy decoding; voice utterances stay well below them
+MAX_INPUT_TOKENS = 256
+MAX_NEW_TOKENS = 256
+
+# Number of recent translations kept in memory
+CACHE_SIZE = 128
+
 
 class Translator:
     """Russian to English translator using MarianMT."""
@@ -9,6 +20,9 @@ class Translator:
     def __init__(self):
         self.model = None
         self.tokenizer = None
+        self.device = "cpu"
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._load_lock = threading.Lock()
         self._on_status: Optional[Callable[[str], None]] = None
 
     def set_status_callback(self, callback: Callable[[str], None]):
@@ -20,14 +34,35 @@ class Translator:
             self._on_status(status)
 
     def load_model(self) -> bool:
-        """Load the translation model."""
+        """Load the translation model.
+
+        Safe to call from several threads; callers racing a load in progress
+        wait for it instead of loading a second copy.
+        """
+        with self._load_lock:
+            if self.model is not None:
+                return True
+            return self._load_model()
+
+    def _load_model(self) -> bool:
         try:
             self._update_status("Loading translator...")
+            import torch
             from transformers import MarianMTModel, MarianTokenizer
 
             model_name = "Helsinki-NLP/opus-mt-ru-en"
             self.tokenizer = MarianTokenizer.from_pretrained(model_name)
-            self.model = MarianMTModel.from_pretrained(model_name)
+            model = MarianMTModel.from_pretrained(model_name).eval()
+
+            # fp16 on GPU, int8 dynamic quantization of the linear layers on CPU
+            if torch.cuda.is_available():
+                self.device = "cuda"
+                model = model.to(self.device, dtype=torch.float16)
+            else:
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            self.model = model
             self._update_status("Translator ready")
             return True
         except Exception as e:
@@ -36,21 +71,72 @@ class Translator:
 
     def translate(self, text: str) -> Optional[str]:
         """Translate Russian text to English."""
-        if not text or not text.strip():
-            return ""
-
-        if self.model is None:
-            if not self.load_model():
+        results = self.translate_batch([text])
+        return results[0] if results is not None else None
+
+    def translate_batch(self, texts: list[str]) -> Optional[list[str]]:
+        """Translate several Russian texts with a single padded generate call."""
+        texts = [" ".join(text.split()) if text else "" for text in texts]
+
+        # Only texts that are neither empty nor cached go to the model
+        pending = list(dict.fromkeys(
+            text for text in texts if text and text not in self._cache
+        ))
+        translated: dict[str, str] = {}
+
+        if pending:
+            if self.model is None:
+                if not self.load_model():
+                    return None
+
+            try:
+                import torch
+
+                inputs = self.tokenizer(
+                    pending, return_tensors="pt", padding=True, truncation=True, max_length=MAX_INPUT_TOKENS
+                ).to(self.device)
+                with torch.inference_mode():
+                    outputs = self.model.generate(**inputs, num_beams=1, max_new_tokens=MAX_NEW_TOKENS)
+                translated = dict(zip(pending, self.tokenizer.batch_decode(outputs, skip_special_tokens=True)))
+            except Exception as e:
+                self._update_status(f"Translation error: {e}")
                 return None
 
-        try:
-            inputs = self.tokenizer(text, return_tensors="pt", padding=True)
-            translated = self.model.generate(**inputs)
-            result = self.tokenizer.decode(translated[0], skip_special_tokens=True)
-            return result
-        except Exception as e:
-            self._update_status(f"Translation error: {e}")
-            return None
+        results = []
+        for text in texts:
+            if not text:
+                results.append("")
+            elif text in translated:
+                results.append(translated[text])
+                self._cache[text] = translated[text]
+            else:
+                results.append(self._cache[text])
+                self._cache.move_to_end(text)
+
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return results
+
+
+class TranslateSignals(QObject):
+    """Signals for TranslateJob; QRunnable itself cannot emit."""
+
+    # Source text and its translation ("" if translation failed)
+    done = pyqtSignal(str, str)
+
+
+class TranslateJob(QRunnable):
+    """Translates one text on a QThreadPool thread."""
+
+    def __init__(self, translator: Translator, text: str):
+        super().__init__()
+        self.translator = translator
+        self.text = text
+        self.signals = TranslateSignals()
+
+    def run(self):
+        translated = self.translator.translate(self.text)
+        self.signals.done.emit(self.text, translated or "")
 
 
 # Singleton instance
@@ -76,6 +162,5 @@ if __name__ == "__main__":
         "Я программирую на Python",
     ]
 
-    for phrase in test_phrases:
-        result = translator.translate(phrase)
+    for phrase, result in zip(test_phrases, translator.translate_batch(test_phrases) or []):
         print(f"{phrase} -> {result}")
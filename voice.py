@@ -3,12 +3,49 @@
 import tempfile
 import threading
 import queue
+import wave
 from pathlib import Path
 from typing import Callable, Optional
 
 import numpy as np
 import sounddevice as sd
-import soundfile as sf
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+# GigaAM's short-form limit; longer audio needs its VAD-based longform path
+MAX_TRANSCRIBE_SECONDS = 25
+
+# How long shutdown waits for a transcription or model load in progress
+SHUTDOWN_TIMEOUT_MS = 2000
+
+
+class TranscribeWorker(QObject):
+    """Runs GigaAM inference on a dedicated thread."""
+
+    requested = pyqtSignal(object)
+    load_requested = pyqtSignal()
+    result = pyqtSignal(str)
+    status = pyqtSignal(str)
+    # Whether the model loaded, once a load has been attempted
+    ready = pyqtSignal(bool)
+
+    def __init__(self, recognizer: "VoiceRecognizer"):
+        super().__init__()
+        self.recognizer = recognizer
+        self.requested.connect(self.run)
+        self.load_requested.connect(self.load)
+
+    @pyqtSlot()
+    def load(self):
+        if self.recognizer.model is None:
+            self.recognizer.load_model()
+        self.ready.emit(self.recognizer.model is not None)
+
+    @pyqtSlot(object)
+    def run(self, audio_data: np.ndarray):
+        transcription = self.recognizer._transcribe(audio_data)
+        if transcription:
+            self.result.emit(transcription)
 
 
 class VoiceRecognizer:
@@ -20,10 +57,25 @@ class VoiceRecognizer:
         self.is_recording = False
         self.audio_queue: queue.Queue = queue.Queue()
         self.sample_rate = 16000
-        self.recorded_audio: list = []
+        self.recorded_audio = np.empty(0, dtype=np.float32)
+        self.recorded_frames = 0
+        self.recording_truncated = False
+        # Set once GigaAM turns out not to have the internals the in-memory path uses
+        self._use_file_api = False
         self._record_thread: Optional[threading.Thread] = None
         self._on_result: Optional[Callable[[str], None]] = None
         self._on_status: Optional[Callable[[str], None]] = None
+        self._on_ready: Optional[Callable[[bool], None]] = None
+
+        # Callbacks are delivered on the thread that created the recognizer,
+        # whichever thread the status or result came from
+        self._worker = TranscribeWorker(self)
+        self._worker.result.connect(self._dispatch_result)
+        self._worker.status.connect(self._dispatch_status)
+        self._worker.ready.connect(self._dispatch_ready)
+        self._worker_thread = QThread()
+        self._worker.moveToThread(self._worker_thread)
+        self._worker_thread.start()
 
     def load_model(self) -> bool:
         """Load the GigaAM model."""
@@ -40,26 +92,51 @@ class VoiceRecognizer:
             self._update_status(f"Failed to load model: {e}")
             return False
 
+    def preload_model(self):
+        """Load the model on the transcription thread ahead of the first recording."""
+        self._worker.load_requested.emit()
+
     def set_callbacks(
         self,
         on_result: Optional[Callable[[str], None]] = None,
-        on_status: Optional[Callable[[str], None]] = None
+        on_status: Optional[Callable[[str], None]] = None,
+        on_ready: Optional[Callable[[bool], None]] = None
     ):
-        """Set callback functions for results and status updates."""
+        """Set callback functions for results, status updates and model readiness."""
         self._on_result = on_result
         self._on_status = on_status
+        self._on_ready = on_ready
 
     def _update_status(self, status: str):
         """Update status via callback."""
+        self._worker.status.emit(status)
+
+    def _dispatch_status(self, status: str):
         if self._on_status:
             self._on_status(status)
 
+    def _dispatch_ready(self, ready: bool):
+        if self._on_ready:
+            self._on_ready(ready)
+
+    def _dispatch_result(self, text: str):
+        if self._on_result:
+            self._on_result(text)
+
     def _audio_callback(self, indata, frames, time, status):
         """Callback for audio recording."""
         if status:
             self._update_status(f"Audio error: {status}")
         if self.is_recording:
-            self.recorded_audio.append(indata.copy())
+            free = len(self.recorded_audio) - self.recorded_frames
+            n = min(frames, free)
+            # Copy the mono channel straight into the recording, no per-block array
+            np.copyto(self.recorded_audio[self.recorded_frames:self.recorded_frames + n], indata[:n, 0])
+            self.recorded_frames += n
+            if n < frames and not self.recording_truncated:
+                # Cut-off speech is not sent; stop_recording discards it
+                self.recording_truncated = True
+                self._update_status(f"Recording limit reached ({MAX_TRANSCRIBE_SECONDS} s), stop and try again")
 
     def start_recording(self):
         """Start recording audio."""
@@ -67,7 +144,10 @@ class VoiceRecognizer:
             return
 
         self.is_recording = True
-        self.recorded_audio = []
+        # One buffer per recording, filled in place by the audio callback
+        self.recorded_audio = np.empty(MAX_TRANSCRIBE_SECONDS * self.sample_rate, dtype=np.float32)
+        self.recorded_frames = 0
+        self.recording_truncated = False
         self._update_status("Recording...")
 
         try:
@@ -82,10 +162,15 @@ class VoiceRecognizer:
             self._update_status(f"Failed to start recording: {e}")
             self.is_recording = False
 
-    def stop_recording(self) -> Optional[str]:
-        """Stop recording and transcribe."""
+    def stop_recording(self) -> bool:
+        """Stop recording and queue the audio for transcription.
+
+        The text is delivered through the result callback. Returns True if
+        there was audio to transcribe; a recording that hit the length limit
+        is discarded rather than sent cut off.
+        """
         if not self.is_recording:
-            return None
+            return False
 
         self.is_recording = False
         self._update_status("Processing...")
@@ -96,20 +181,15 @@ class VoiceRecognizer:
         except Exception as e:
             self._update_status(f"Error stopping stream: {e}")
 
-        if not self.recorded_audio:
+        if not self.recorded_frames:
             self._update_status("No audio recorded")
-            return None
-
-        # Concatenate all recorded audio
-        audio_data = np.concatenate(self.recorded_audio, axis=0)
-
-        # Transcribe
-        transcription = self._transcribe(audio_data)
-
-        if transcription and self._on_result:
-            self._on_result(transcription)
+            return False
+        if self.recording_truncated:
+            self._update_status(f"Recording longer than {MAX_TRANSCRIBE_SECONDS} s, discarded")
+            return False
 
-        return transcription
+        self._worker.requested.emit(self.recorded_audio[:self.recorded_frames])
+        return True
 
     def _transcribe(self, audio_data: np.ndarray) -> Optional[str]:
         """Transcribe audio data using GigaAM."""
@@ -118,17 +198,17 @@ class VoiceRecognizer:
                 return None
 
         try:
-            # Save audio to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                temp_path = f.name
-                sf.write(temp_path, audio_data, self.sample_rate)
-
-            # Transcribe
             self._update_status("Transcribing...")
-            transcription = self.model.transcribe(temp_path)
-
-            # Clean up
-            Path(temp_path).unlink(missing_ok=True)
+            if self._use_file_api:
+                transcription = self._transcribe_file(audio_data)
+            else:
+                try:
+                    transcription = self._transcribe_samples(audio_data)
+                except AttributeError:
+                    # The in-memory path relies on GigaAM internals that are not
+                    # public API; if they are gone, use transcribe() from now on
+                    self._use_file_api = True
+                    transcription = self._transcribe_file(audio_data)
 
             self._update_status("Ready")
             return transcription
@@ -137,6 +217,36 @@ class VoiceRecognizer:
             self._update_status(f"Transcription error: {e}")
             return None
 
+    def _transcribe_samples(self, audio_data: np.ndarray) -> str:
+        """Run the model on the samples directly.
+
+        This is what model.transcribe() does after decoding a wav file via
+        ffmpeg, minus the file and the ffmpeg process.
+        """
+        import torch
+
+        model = self.model
+        wav = torch.from_numpy(audio_data).to(model._device).to(model._dtype).unsqueeze(0)
+        length = torch.full([1], wav.shape[-1], device=model._device)
+        with torch.inference_mode():
+            encoded, encoded_len = model.forward(wav, length)
+            return model.decoding.decode(model.head, encoded, encoded_len)[0]
+
+    def _transcribe_file(self, audio_data: np.ndarray) -> str:
+        """Transcribe through GigaAM's public API, which takes a wav file path."""
+        pcm = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+            temp_path = f.name
+        try:
+            with wave.open(temp_path, "wb") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self.sample_rate)
+                wav_file.writeframes(pcm.tobytes())
+            return self.model.transcribe(temp_path)
+        finally:
+            Path(temp_path).unlink(missing_ok=True)
+
     def toggle_recording(self) -> bool:
         """Toggle recording state. Returns True if now recording."""
         if self.is_recording:
@@ -146,14 +256,34 @@ class VoiceRecognizer:
             self.start_recording()
             return True
 
+    def shutdown(self):
+        """Stop the transcription thread, waiting briefly for work in progress.
+
+        A model load (or its first-run download) cannot be interrupted and
+        may take far longer than the wait. The thread is then left to end
+        with the process: destroying a running QThread aborts, so the thread
+        and its worker are handed over to C++ and never deleted.
+        """
+        self._worker_thread.quit()
+        if not self._worker_thread.wait(SHUTDOWN_TIMEOUT_MS):
+            sip.transferto(self._worker, None)
+            sip.transferto(self._worker_thread, None)
+
 
 # Simple test
 if __name__ == "__main__":
+    from PyQt6.QtCore import QCoreApplication
+
+    app = QCoreApplication([])
+
     def on_result(text):
         print(f"Transcription: {text}")
+        app.quit()
 
     def on_status(status):
         print(f"Status: {status}")
+        if "error" in status.lower():
+            app.quit()
 
     recognizer = VoiceRecognizer()
     recognizer.set_callbacks(on_result, on_status)
@@ -162,4 +292,6 @@ if __name__ == "__main__":
     input()
     recognizer.start_recording()
     input()
-    recognizer.stop_recording()
+    if recognizer.stop_recording():
+        app.exec()
+    recognizer.shutdown()
@@ -3,7 +3,14 @@
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLabel
 from PyQt6.QtCore import Qt, QPoint, pyqtSignal
 
-from theme import COLORS, get_theme
+from theme import get_theme
+
+
+def repolish(widget: QWidget):
+    """Re-evaluate stylesheet rules after a dynamic property changed."""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
 
 
 class TitleBar(QWidget):
@@ -18,7 +25,8 @@ class TitleBar(QWidget):
 
     def setup_ui(self):
         self.setFixedHeight(36)
-        self.setStyleSheet(f"background-color: {COLORS['bg_primary']};")
+        self.setObjectName("titleBar")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(12, 0, 0, 0)
@@ -26,11 +34,7 @@ class TitleBar(QWidget):
 
         # App label "Claude" with dot
         app_label = QLabel("●  Claude")
-        app_label.setStyleSheet(f"""
-            color: {COLORS['text_muted']};
-            font-size: 13px;
-            padding-right: 12px;
-        """)
+        app_label.setObjectName("appLabel")
         layout.addWidget(app_label)
 
         # Tab bar container
@@ -43,68 +47,27 @@ class TitleBar(QWidget):
         layout.addStretch()
 
         # Control buttons
-        btn_style = f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {COLORS['text_muted']};
-                border: none;
-                padding: 6px 12px;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['bg_hover']};
-                color: {COLORS['text_primary']};
-            }}
-        """
-
         self.new_tab_btn = QPushButton("+")
         self.new_tab_btn.setToolTip("New Session (Ctrl+T)")
-        self.new_tab_btn.setStyleSheet(btn_style)
+        self.new_tab_btn.setObjectName("newTabButton")
         self.new_tab_btn.setFixedSize(36, 36)
         layout.addWidget(self.new_tab_btn)
 
         # Window controls
-        win_btn_style = f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {COLORS['text_muted']};
-                border: none;
-                padding: 8px 14px;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['bg_hover']};
-                color: {COLORS['text_primary']};
-            }}
-        """
-
         self.min_btn = QPushButton("—")
-        self.min_btn.setStyleSheet(win_btn_style)
+        self.min_btn.setObjectName("minimizeButton")
         self.min_btn.setFixedSize(46, 36)
         self.min_btn.clicked.connect(lambda: self.parent_window.showMinimized())
         layout.addWidget(self.min_btn)
 
         self.max_btn = QPushButton("□")
-        self.max_btn.setStyleSheet(win_btn_style)
+        self.max_btn.setObjectName("maximizeButton")
         self.max_btn.setFixedSize(46, 36)
         self.max_btn.clicked.connect(self.toggle_maximize)
         layout.addWidget(self.max_btn)
 
-        close_btn_style = f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {COLORS['text_muted']};
-                border: none;
-                padding: 8px 14px;
-                font-size: 14px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['close_hover']};
-                color: white;
-            }}
-        """
         self.close_btn = QPushButton("×")
-        self.close_btn.setStyleSheet(close_btn_style)
+        self.close_btn.setObjectName("closeButton")
         self.close_btn.setFixedSize(46, 36)
         self.close_btn.clicked.connect(lambda: self.parent_window.close())
         layout.addWidget(self.close_btn)
@@ -143,23 +106,26 @@ class StatusBar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_recording = False
+        self._last_status = "Ready"
         self.setup_ui()
 
     def setup_ui(self):
         self.setFixedHeight(26)
-        self.setStyleSheet(f"background-color: {COLORS['bg_secondary']};")
+        self.setObjectName("statusBar")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
 
         layout = QHBoxLayout(self)
         layout.setContentsMargins(14, 0, 14, 0)
 
-        self.status_label = QLabel("Ready")
-        self.status_label.setStyleSheet(f"color: {COLORS['text_muted']}; font-size: 11px;")
+        self.status_label = QLabel(self._last_status)
+        self.status_label.setObjectName("statusLabel")
         layout.addWidget(self.status_label)
 
         layout.addStretch()
 
         # Microphone button
         self.mic_btn = QPushButton("🎤")
+        self.mic_btn.setObjectName("micButton")
         self.mic_btn.setToolTip("Voice Input (click to record)")
         self.mic_btn.setFixedSize(24, 20)
         self.mic_btn.clicked.connect(self._on_mic_clicked)
@@ -169,63 +135,24 @@ class StatusBar(QWidget):
         # Theme toggle button
         self.theme_btn = QPushButton("🌙" if get_theme() == 'dark' else "☀️")
         self.theme_btn.setToolTip("Toggle theme")
+        self.theme_btn.setObjectName("themeButton")
         self.theme_btn.setFixedSize(24, 20)
         self.theme_btn.clicked.connect(self._on_theme_clicked)
-        self._update_theme_btn_style()
         layout.addWidget(self.theme_btn)
 
         self.hints = QLabel("Alt+T voice | Ctrl+T new | Ctrl+W close")
-        self.hints.setStyleSheet(f"color: {COLORS['text_muted']}; font-size: 10px; margin-left: 10px;")
+        self.hints.setObjectName("hintsLabel")
         layout.addWidget(self.hints)
 
     def _update_mic_style(self):
         """Update microphone button style based on recording state."""
+        self.mic_btn.setProperty("recording", self.is_recording)
+        repolish(self.mic_btn)
         if self.is_recording:
-            self.mic_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #cc4444;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: #dd5555;
-                }}
-            """)
             self.mic_btn.setToolTip("Recording... (click to stop)")
         else:
-            self.mic_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLORS['bg_tertiary']};
-                    color: {COLORS['text_muted']};
-                    border: none;
-                    border-radius: 4px;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLORS['bg_hover']};
-                    color: {COLORS['text_primary']};
-                }}
-            """)
             self.mic_btn.setToolTip("Voice Input (click to record)")
 
-    def _update_theme_btn_style(self):
-        """Update theme button style."""
-        self.theme_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLORS['bg_tertiary']};
-                color: {COLORS['text_muted']};
-                border: none;
-                border-radius: 4px;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {COLORS['bg_hover']};
-                color: {COLORS['text_primary']};
-            }}
-        """)
-
     def _on_mic_clicked(self):
         """Handle microphone button click."""
         self.mic_clicked.emit()
@@ -243,5 +170,17 @@ class StatusBar(QWidget):
         self.is_recording = recording
         self._update_mic_style()
 
+    def set_voice_ready(self, ready: bool):
+        """Enable the microphone button once voice input can be used."""
+        self.mic_btn.setEnabled(ready)
+        if not ready:
+            self.mic_btn.setToolTip("Voice input unavailable")
+        else:
+            self._update_mic_style()
+
     def set_status(self, text: str):
+        # Repeated messages (e.g. a burst of identical worker updates) leave the label alone
+        if text == self._last_status:
+            return
+        self._last_status = text
         self.status_label.setText(text)
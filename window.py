@@ -1,31 +1,54 @@
 """Main application window."""
 
+import sys
+from contextlib import contextmanager
+from functools import partial
+
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QPushButton, QFrame, QStackedWidget
+    QMainWindow, QWidget, QVBoxLayout, QPushButton, QButtonGroup, QFrame
 )
-from PyQt6.QtCore import Qt, QRectF, pyqtSlot, QTimer
-from PyQt6.QtGui import QColor, QPainter, QPainterPath
+from PyQt6 import sip
+from PyQt6.QtCore import Qt, QRectF, pyqtSignal, pyqtSlot, QThreadPool, QTimer
+from PyQt6.QtGui import QPainterPath, QRegion
+
+from theme import get_stylesheet, toggle_theme, get_theme
+from terminal import TerminalSession, TerminalView
+from widgets import TitleBar, StatusBar, repolish
+from voice import SHUTDOWN_TIMEOUT_MS, VoiceRecognizer
+from translator import TranslateJob, get_translator
+
+# Claude CLI treats text and Enter arriving in one read as a paste and
+# inserts a newline instead of submitting, so Enter follows separately
+SUBMIT_DELAY_MS = 100
 
-from theme import COLORS, toggle_theme, get_theme
-from terminal import TerminalWidget
-from widgets import TitleBar, StatusBar
-from voice import VoiceRecognizer
-from translator import get_translator
+# Theme toggles within one frame are applied as a single restyle
+THEME_APPLY_DELAY_MS = 16
+
+# Fixed status messages
+STATUS_LOADING_VOICE = sys.intern("Loading voice model...")
+STATUS_VOICE_READY = sys.intern("Voice ready")
+STATUS_VOICE_NOT_READY = sys.intern("Voice not ready")
+STATUS_TRANSLATING = sys.intern("Translating...")
+STATUS_SESSION_CLOSED = sys.intern("Session closed")
 
 
 class ClaudeWindow(QMainWindow):
     """Main application window."""
 
+    # Status text from worker threads, delivered on the GUI thread
+    status_message = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.session_counter = 0
         self.tab_buttons: list[QPushButton] = []
-        self.terminals: list[TerminalWidget] = []
+        self.terminals: list[TerminalSession] = []
         self.current_tab_index = -1
 
         self.setup_window()
         self.setup_ui()
-        self.setup_voice()
+        self._wire_voice_ui()
+        self.setup_shortcuts()
         self.create_session()
 
     def setup_window(self):
@@ -34,11 +57,16 @@ class ClaudeWindow(QMainWindow):
         self.resize(1200, 800)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setStyleSheet(get_stylesheet())
+
+        self._apply_theme_timer = QTimer(self)
+        self._apply_theme_timer.setSingleShot(True)
+        self._apply_theme_timer.setInterval(THEME_APPLY_DELAY_MS)
+        self._apply_theme_timer.timeout.connect(self._apply_theme)
 
     def setup_ui(self):
         central = QWidget()
         central.setObjectName("central")
-        central.setStyleSheet(f"#central {{ background-color: {COLORS['bg_primary']}; border-radius: 10px; }}")
         self.setCentralWidget(central)
 
         layout = QVBoxLayout(central)
@@ -50,38 +78,81 @@ class ClaudeWindow(QMainWindow):
         self.title_bar.new_tab_btn.clicked.connect(self.create_session)
         layout.addWidget(self.title_bar)
 
-        # Content area
-        self.stack = QStackedWidget()
-        self.stack.setStyleSheet(f"background-color: {COLORS['bg_primary']};")
-        layout.addWidget(self.stack)
+        # Tab buttons, identified by their index; the group keeps one checked
+        self.tab_group = QButtonGroup(self)
+        self.tab_group.idClicked.connect(self.switch_tab)
+
+        # Content area; one view shows whichever session's tab is selected
+        self.terminal_view = TerminalView()
+        layout.addWidget(self.terminal_view)
 
         # Border line
         line = QFrame()
         line.setFixedHeight(1)
-        line.setStyleSheet(f"background-color: {COLORS['border']};")
+        line.setObjectName("separator")
         layout.addWidget(line)
 
         # Status bar
         self.status_bar = StatusBar()
         layout.addWidget(self.status_bar)
 
-    def setup_voice(self):
-        """Set up voice recognition and translation."""
+    def setup_shortcuts(self):
+        """Map (modifiers, key) to the window-level shortcut handlers."""
+        ctrl = Qt.KeyboardModifier.ControlModifier
+        alt = Qt.KeyboardModifier.AltModifier
+        shift = Qt.KeyboardModifier.ShiftModifier
+        self._shortcuts = {
+            (ctrl.value, Qt.Key.Key_T): self.create_session,
+            (ctrl.value, Qt.Key.Key_W): self.close_session,
+            (alt.value, Qt.Key.Key_T): self._toggle_voice_recording,
+            ((ctrl | shift).value, Qt.Key.Key_Q): self.close,
+        }
+
+    def _wire_voice_ui(self):
+        """Set up voice recognition and translation; models load in preload_models."""
+        self.voice_ready = False
         self.voice_recognizer = VoiceRecognizer(model_name="v3_ctc")
         self.voice_recognizer.set_callbacks(
             on_result=self._on_voice_result,
-            on_status=self._on_voice_status
+            on_status=self._on_voice_status,
+            on_ready=self._on_voice_ready
         )
+        self.status_bar.set_voice_ready(False)
         self.status_bar.mic_clicked.connect(self._toggle_voice_recording)
         self.status_bar.theme_clicked.connect(self._toggle_theme)
 
-        # Set up translator
+        # Set up translator; one thread keeps translations in dictation order
         self.translator = get_translator()
-        self.translator.set_status_callback(self._on_voice_status)
+        self.translate_pool = QThreadPool(self)
+        self.translate_pool.setMaxThreadCount(1)
+        self.status_message.connect(self._on_voice_status)
+        self.translator.set_status_callback(self.status_message.emit)
+
+    def preload_models(self):
+        """Load the speech and translation models in the background."""
+        self._load_voice_async()
+        # On the window's own pool rather than the global one, which the
+        # application waits on without a timeout when it exits
+        self.translate_pool.start(self.translator.load_model)
+
+    def _load_voice_async(self):
+        """Load the speech model on the transcription thread; the mic waits for it."""
+        self.status_bar.set_status(STATUS_LOADING_VOICE)
+        self.voice_recognizer.preload_model()
+
+    def _on_voice_ready(self, ready: bool):
+        """Enable voice input once the speech model has loaded."""
+        self.voice_ready = ready
+        self.status_bar.set_voice_ready(ready)
+        if ready:
+            self.status_bar.set_status(STATUS_VOICE_READY)
 
     @pyqtSlot()
     def _toggle_voice_recording(self):
         """Toggle voice recording on/off."""
+        if not self.voice_ready:
+            self.status_bar.set_status(STATUS_VOICE_NOT_READY)
+            return
         is_recording = self.voice_recognizer.toggle_recording()
         self.status_bar.set_recording(is_recording)
 
@@ -90,70 +161,48 @@ class ClaudeWindow(QMainWindow):
         """Toggle between dark and light theme."""
         new_theme = toggle_theme()
         self.status_bar.update_theme_icon(new_theme)
-        self._apply_theme()
+        self._apply_theme_timer.start()
         self.status_bar.set_status(f"Theme: {new_theme}")
 
+    @contextmanager
+    def batch_ui_updates(self):
+        """Hold layout-triggered repaints until the block is done, then repaint once."""
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+
     def _apply_theme(self):
         """Apply current theme to all widgets."""
-        # Central widget
-        central = self.centralWidget()
-        central.setStyleSheet(f"#central {{ background-color: {COLORS['bg_primary']}; border-radius: 10px; }}")
-
-        # Stack
-        self.stack.setStyleSheet(f"background-color: {COLORS['bg_primary']};")
-
-        # Title bar
-        self.title_bar.setStyleSheet(f"background-color: {COLORS['bg_primary']};")
-
-        # Status bar
-        self.status_bar.setStyleSheet(f"background-color: {COLORS['bg_secondary']};")
-        self.status_bar.status_label.setStyleSheet(f"color: {COLORS['text_muted']}; font-size: 11px;")
-        self.status_bar._update_mic_style()
-        self.status_bar._update_theme_btn_style()
-
-        # Terminals
-        for terminal in self.terminals:
-            terminal.setStyleSheet(f"""
-                QPlainTextEdit {{
-                    background-color: {COLORS['terminal_bg']};
-                    color: {COLORS['terminal_fg']};
-                    border: none;
-                    padding: 8px;
-                    selection-background-color: {COLORS['accent']};
-                }}
-                QScrollBar:vertical {{
-                    background: {COLORS['bg_primary']};
-                    width: 10px;
-                    border-radius: 5px;
-                }}
-                QScrollBar::handle:vertical {{
-                    background: {COLORS['border']};
-                    border-radius: 5px;
-                    min-height: 20px;
-                }}
-            """)
-
-        # Tab buttons
-        for i, btn in enumerate(self.tab_buttons):
-            self.update_tab_style(btn, i == self.current_tab_index)
-
-        # Force repaint
-        self.update()
+        # One stylesheet for the whole window; Qt re-polishes the children once
+        with self.batch_ui_updates():
+            self.setStyleSheet(get_stylesheet())
 
     def _on_voice_result(self, text: str):
-        """Handle transcription result - translate, insert into terminal, and send."""
+        """Handle transcription result - translate it off the GUI thread."""
         if text and 0 <= self.current_tab_index < len(self.terminals):
+            # The text goes to the tab it was dictated in, even if another
+            # tab is selected by the time the translation is done
             terminal = self.terminals[self.current_tab_index]
             # Translate Russian to English
-            self._on_voice_status("Translating...")
-            translated = self.translator.translate(text)
-            output = translated if translated else text
-            terminal.write_to_pty(output)
-            # Auto-press Enter after small delay
-            QTimer.singleShot(100, lambda: terminal.write_to_pty("\r"))
-            self._on_voice_status(f"Sent: {output[:40]}...")
+            self._on_voice_status(STATUS_TRANSLATING)
+            job = TranslateJob(self.translator, text)
+            job.signals.done.connect(partial(self._on_translation_ready, terminal))
+            self.translate_pool.start(job)
         self.status_bar.set_recording(False)
 
+    def _on_translation_ready(self, terminal: TerminalSession, text: str, translated: str):
+        """Insert the translation into the dictating terminal and send it."""
+        if terminal not in self.terminals:
+            # The tab was closed while translating
+            return
+        output = translated if translated else text
+        terminal.write_to_pty(output)
+        QTimer.singleShot(SUBMIT_DELAY_MS, partial(terminal.write_to_pty, "\r"))
+        self._on_voice_status(f"Sent: {output[:40]}...")
+
     def _on_voice_status(self, status: str):
         """Handle voice status updates."""
         self.status_bar.set_status(status)
@@ -161,119 +210,90 @@ class ClaudeWindow(QMainWindow):
     def create_session(self):
         """Create a new terminal session."""
         self.session_counter += 1
-        terminal = TerminalWidget()
-        self.terminals.append(terminal)
-        self.stack.addWidget(terminal)
+        self.terminals.append(TerminalSession(self))
 
         # Create tab button
         tab_btn = QPushButton(f"Claude {self.session_counter}")
+        tab_btn.setObjectName("tabButton")
         tab_btn.setCheckable(True)
         tab_index = len(self.tab_buttons)
-        tab_btn.clicked.connect(lambda checked, idx=tab_index: self.switch_tab(idx))
         self.update_tab_style(tab_btn, False)
         self.tab_buttons.append(tab_btn)
+        self.tab_group.addButton(tab_btn, tab_index)
         self.title_bar.tab_layout.addWidget(tab_btn)
 
         self.switch_tab(tab_index)
         self.status_bar.set_status(f"Created: Claude {self.session_counter}")
-        terminal.setFocus()
 
     def switch_tab(self, index: int):
         """Switch to a specific tab."""
         if 0 <= index < len(self.terminals):
             self.current_tab_index = index
-            self.stack.setCurrentIndex(index)
+            self.terminal_view.set_session(self.terminals[index])
+            self.tab_buttons[index].setChecked(True)
             for i, btn in enumerate(self.tab_buttons):
                 self.update_tab_style(btn, i == index)
-                btn.setChecked(i == index)
-            self.terminals[index].setFocus()
+            self.terminal_view.setFocus()
 
     def update_tab_style(self, btn: QPushButton, selected: bool):
         """Update tab button style."""
-        if selected:
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLORS['bg_tertiary']};
-                    color: {COLORS['text_primary']};
-                    border: none;
-                    border-radius: 6px;
-                    padding: 6px 12px;
-                    font-size: 12px;
-                }}
-            """)
-        else:
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: transparent;
-                    color: {COLORS['text_muted']};
-                    border: none;
-                    border-radius: 6px;
-                    padding: 6px 12px;
-                    font-size: 12px;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLORS['bg_hover']};
-                    color: {COLORS['text_secondary']};
-                }}
-            """)
+        if btn.property("tabSelected") != selected:
+            btn.setProperty("tabSelected", selected)
+            repolish(btn)
 
     def close_session(self, index: int = None):
         """Close a terminal session."""
         if index is None:
             index = self.current_tab_index
         if len(self.terminals) > 1 and 0 <= index < len(self.terminals):
-            terminal = self.terminals[index]
-            terminal.cleanup()
-            self.stack.removeWidget(terminal)
-            self.terminals.pop(index)
-
-            btn = self.tab_buttons.pop(index)
-            self.title_bar.tab_layout.removeWidget(btn)
-            btn.deleteLater()
-
-            for i, b in enumerate(self.tab_buttons):
-                b.clicked.disconnect()
-                b.clicked.connect(lambda checked, idx=i: self.switch_tab(idx))
-
-            new_index = min(index, len(self.terminals) - 1)
-            self.switch_tab(new_index)
-            self.status_bar.set_status("Session closed")
+            with self.batch_ui_updates():
+                terminal = self.terminals.pop(index)
+                terminal.cleanup()
+                terminal.deleteLater()
+
+                btn = self.tab_buttons.pop(index)
+                self.tab_group.removeButton(btn)
+                self.title_bar.tab_layout.removeWidget(btn)
+                btn.deleteLater()
+                # Tabs after the closed one move down by one
+                for i in range(index, len(self.tab_buttons)):
+                    self.tab_group.setId(self.tab_buttons[i], i)
+
+                new_index = min(index, len(self.terminals) - 1)
+                self.switch_tab(new_index)
+            self.status_bar.set_status(STATUS_SESSION_CLOSED)
 
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts."""
-        modifiers = event.modifiers()
-        key = event.key()
-
-        if modifiers == Qt.KeyboardModifier.ControlModifier:
-            if key == Qt.Key.Key_T:
-                self.create_session()
-                return
-            elif key == Qt.Key.Key_W:
-                self.close_session()
-                return
-        elif modifiers == Qt.KeyboardModifier.AltModifier:
-            if key == Qt.Key.Key_T:
-                self._toggle_voice_recording()
-                return
-        elif modifiers == (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier):
-            if key == Qt.Key.Key_Q:
-                self.close()
-                return
-
-        if 0 <= self.current_tab_index < len(self.terminals):
-            self.terminals[self.current_tab_index].keyPressEvent(event)
+        handler = self._shortcuts.get((event.modifiers().value, event.key()))
+        if handler:
+            handler()
+            return
+
+        self.terminal_view.keyPressEvent(event)
 
     def closeEvent(self, event):
         """Clean up on close."""
+        # cleanup() does not block, so the sessions are simply closed in turn
         for terminal in self.terminals:
             terminal.cleanup()
+        self.voice_recognizer.shutdown()
+
+        # As with the voice thread, a model load cannot be interrupted; give
+        # up waiting on it and keep the pool from being destroyed while busy
+        self.translate_pool.clear()
+        if not self.translate_pool.waitForDone(SHUTDOWN_TIMEOUT_MS):
+            self.translate_pool.setParent(None)
+            sip.transferto(self.translate_pool, None)
         event.accept()
 
-    def paintEvent(self, event):
-        """Paint rounded corners."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        rect = self.rect().adjusted(2, 2, -2, -2)
+    def resizeEvent(self, event):
+        """Clip the frameless window to rounded corners.
+
+        The mask is built here, once per size; the window itself paints
+        nothing, so there is no per-paint color or path to build.
+        """
+        super().resizeEvent(event)
         path = QPainterPath()
-        path.addRoundedRect(QRectF(rect), 10.0, 10.0)
-        painter.fillPath(path, QColor(COLORS['bg_primary']))
+        path.addRoundedRect(QRectF(self.rect()), 10.0, 10.0)
+        self.setMask(QRegion(path.toFillPolygon().toPolygon()))